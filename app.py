@@ -6,6 +6,14 @@ import os
 import uuid
 import requests
 from datetime import datetime
+from html import escape
+from urllib.parse import quote
+from template_registry import TemplateRegistry, UnknownAppTypeError
+
+try:
+    import orjson  # optional, much faster than the json module
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
@@ -13,6 +21,9 @@ app.secret_key = os.urandom(24)
 # Store API key temporarily in memory
 api_key_storage = {}
 
+# App layouts are loaded from app_templates/ once and reloaded when the files change
+template_registry = TemplateRegistry()
+
 # HTML template for the web interface
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -169,10 +180,7 @@ HTML_TEMPLATE = '''
             <div class="form-group">
                 <label for="appType">App Type:</label>
                 <select id="appType" name="appType">
-                    <option value="basic">Basic App</option>
-                    <option value="calculator">Calculator</option>
-                    <option value="counter">Counter App</option>
-                    <option value="clicker">Button Clicker</option>
+{{APP_TYPE_OPTIONS}}
                 </select>
             </div>
 
@@ -256,6 +264,19 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+def serialize_json(data, compact=True):
+    """Serialize data for a .scm/.bky file, compactly unless asked for readable output"""
+    if orjson is not None:
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2).decode('utf-8')
+    # Write raw UTF-8 like orjson does; writestr encodes the text as UTF-8
+    if compact:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+    return json.dumps(data, indent=2, separators=(',', ': '), ensure_ascii=False)
+
+def wrap_json_envelope(json_text):
+    """Wrap JSON in the $JSON comment block App Inventor uses for .scm/.bky files"""
+    return f'#|\n$JSON\n{json_text}\n|#'
+
 def create_blocks_for_app_type(app_type, components):
     """Create a simple, valid blocks structure for MIT App Inventor"""
 
@@ -276,262 +297,8 @@ def create_blocks_for_app_type(app_type, components):
 def create_project_structure(app_name, app_type, prompt):
     """Create MIT App Inventor compatible project structure"""
 
-    components = []
-
-    # Create components based on app type
-    if app_type == "calculator":
-        # Vertical arrangement for display
-        display_arrangement = {
-            "$Name": "DisplayArrangement",
-            "$Type": "VerticalArrangement",
-            "$Version": "3",
-            "AlignHorizontal": "3",
-            "Width": "-2",
-            "Height": "100",
-            "Uuid": str(uuid.uuid4()),
-            "$Components": [
-                {
-                    "$Name": "DisplayLabel",
-                    "$Type": "Label",
-                    "$Version": "5",
-                    "FontSize": "24",
-                    "Text": "0",
-                    "TextAlignment": "2",
-                    "BackgroundColor": "&HFFF5F5F5",
-                    "Width": "-2",
-                    "Height": "-2",
-                    "Uuid": str(uuid.uuid4())
-                }
-            ]
-        }
-        components.append(display_arrangement)
-
-        # Horizontal arrangement for buttons
-        button_arrangement = {
-            "$Name": "ButtonArrangement",
-            "$Type": "TableArrangement",
-            "$Version": "2",
-            "Columns": "4",
-            "Rows": "4",
-            "Width": "-2",
-            "Height": "300",
-            "Uuid": str(uuid.uuid4()),
-            "$Components": []
-        }
-
-        # Number buttons and operations
-        buttons = [
-            ("7", "Button7"), ("8", "Button8"), ("9", "Button9"), ("/", "ButtonDivide"),
-            ("4", "Button4"), ("5", "Button5"), ("6", "Button6"), ("*", "ButtonMultiply"),
-            ("1", "Button1"), ("2", "Button2"), ("3", "Button3"), ("-", "ButtonMinus"),
-            ("0", "Button0"), ("C", "ButtonClear"), ("=", "ButtonEquals"), ("+", "ButtonPlus")
-        ]
-
-        for text, name in buttons:
-            btn = {
-                "$Name": name,
-                "$Type": "Button",
-                "$Version": "6",
-                "Text": text,
-                "FontSize": "18",
-                "Width": "80",
-                "Height": "60",
-                "Uuid": str(uuid.uuid4())
-            }
-            if text in ["+", "-", "*", "/", "="]:
-                btn["BackgroundColor"] = "&HFFFFA500"
-            button_arrangement["$Components"].append(btn)
-
-        components.append(button_arrangement)
-
-    elif app_type == "counter":
-        # Main arrangement
-        main_arrangement = {
-            "$Name": "MainArrangement",
-            "$Type": "VerticalArrangement",
-            "$Version": "3",
-            "AlignHorizontal": "3",
-            "AlignVertical": "2",
-            "Width": "-2",
-            "Height": "-2",
-            "Uuid": str(uuid.uuid4()),
-            "$Components": [
-                {
-                    "$Name": "TitleLabel",
-                    "$Type": "Label",
-                    "$Version": "5",
-                    "FontSize": "24",
-                    "Text": "Counter App",
-                    "TextAlignment": "1",
-                    "Width": "-2",
-                    "Height": "60",
-                    "Uuid": str(uuid.uuid4())
-                },
-                {
-                    "$Name": "CounterLabel",
-                    "$Type": "Label",
-                    "$Version": "5",
-                    "FontSize": "48",
-                    "Text": "0",
-                    "TextAlignment": "1",
-                    "Width": "-2",
-                    "Height": "120",
-                    "BackgroundColor": "&HFFF0F0F0",
-                    "Uuid": str(uuid.uuid4())
-                },
-                {
-                    "$Name": "ButtonArrangement",
-                    "$Type": "HorizontalArrangement",
-                    "$Version": "3",
-                    "AlignHorizontal": "3",
-                    "Width": "-2",
-                    "Height": "80",
-                    "Uuid": str(uuid.uuid4()),
-                    "$Components": [
-                        {
-                            "$Name": "DecrementButton",
-                            "$Type": "Button",
-                            "$Version": "6",
-                            "Text": "-",
-                            "FontSize": "24",
-                            "BackgroundColor": "&HFFF44336",
-                            "TextColor": "&HFFFFFFFF",
-                            "Width": "80",
-                            "Height": "80",
-                            "Uuid": str(uuid.uuid4())
-                        },
-                        {
-                            "$Name": "IncrementButton",
-                            "$Type": "Button",
-                            "$Version": "6",
-                            "Text": "+",
-                            "FontSize": "24",
-                            "BackgroundColor": "&HFF4CAF50",
-                            "TextColor": "&HFFFFFFFF",
-                            "Width": "80",
-                            "Height": "80",
-                            "Uuid": str(uuid.uuid4())
-                        }
-                    ]
-                },
-                {
-                    "$Name": "ResetButton",
-                    "$Type": "Button",
-                    "$Version": "6",
-                    "Text": "Reset",
-                    "FontSize": "18",
-                    "BackgroundColor": "&HFF9E9E9E",
-                    "Width": "120",
-                    "Height": "50",
-                    "Uuid": str(uuid.uuid4())
-                }
-            ]
-        }
-        components.append(main_arrangement)
-
-    elif app_type == "clicker":
-        # Main vertical arrangement
-        main_arrangement = {
-            "$Name": "MainArrangement",
-            "$Type": "VerticalArrangement",
-            "$Version": "3",
-            "AlignHorizontal": "3",
-            "AlignVertical": "2",
-            "Width": "-2",
-            "Height": "-2",
-            "Uuid": str(uuid.uuid4()),
-            "$Components": [
-                {
-                    "$Name": "ScoreLabel",
-                    "$Type": "Label",
-                    "$Version": "5",
-                    "FontSize": "32",
-                    "Text": "Score: 0",
-                    "TextAlignment": "1",
-                    "Width": "-2",
-                    "Height": "80",
-                    "BackgroundColor": "&HFFE3F2FD",
-                    "Uuid": str(uuid.uuid4())
-                },
-                {
-                    "$Name": "ClickButton",
-                    "$Type": "Button",
-                    "$Version": "6",
-                    "Text": "🎯 CLICK ME! 🎯",
-                    "FontSize": "20",
-                    "BackgroundColor": "&HFF2196F3",
-                    "TextColor": "&HFFFFFFFF",
-                    "Width": "250",
-                    "Height": "150",
-                    "Uuid": str(uuid.uuid4())
-                },
-                {
-                    "$Name": "ResetButton",
-                    "$Type": "Button",
-                    "$Version": "6",
-                    "Text": "Reset Score",
-                    "FontSize": "16",
-                    "BackgroundColor": "&HFFFF9800",
-                    "TextColor": "&HFFFFFFFF",
-                    "Width": "150",
-                    "Height": "60",
-                    "Uuid": str(uuid.uuid4())
-                }
-            ]
-        }
-        components.append(main_arrangement)
-
-    else:  # basic app
-        # Main vertical arrangement
-        main_arrangement = {
-            "$Name": "MainArrangement",
-            "$Type": "VerticalArrangement",
-            "$Version": "3",
-            "AlignHorizontal": "3",
-            "AlignVertical": "2",
-            "Width": "-2",
-            "Height": "-2",
-            "Uuid": str(uuid.uuid4()),
-            "$Components": [
-                {
-                    "$Name": "WelcomeLabel",
-                    "$Type": "Label",
-                    "$Version": "5",
-                    "FontSize": "24",
-                    "Text": f"Welcome to {app_name}!",
-                    "TextAlignment": "1",
-                    "Width": "-2",
-                    "Height": "100",
-                    "BackgroundColor": "&HFFE8F5E9",
-                    "Uuid": str(uuid.uuid4())
-                },
-                {
-                    "$Name": "ActionButton",
-                    "$Type": "Button",
-                    "$Version": "6",
-                    "Text": "Click Me!",
-                    "FontSize": "20",
-                    "BackgroundColor": "&HFF4CAF50",
-                    "TextColor": "&HFFFFFFFF",
-                    "Width": "200",
-                    "Height": "80",
-                    "Uuid": str(uuid.uuid4())
-                },
-                {
-                    "$Name": "StatusLabel",
-                    "$Type": "Label",
-                    "$Version": "5",
-                    "FontSize": "18",
-                    "Text": "Ready to interact!",
-                    "TextAlignment": "1",
-                    "Width": "-2",
-                    "Height": "60",
-                    "BackgroundColor": "&HFFF3E5F5",
-                    "Uuid": str(uuid.uuid4())
-                }
-            ]
-        }
-        components.append(main_arrangement)
+    # Look up the declarative layout for this app type (see app_templates/)
+    components = template_registry.get(app_type).render(app_name)
 
     # Create the main project structure - this is the key format for MIT App Inventor
     project_data = {
@@ -560,7 +327,11 @@ def create_project_structure(app_name, app_type, prompt):
 
 @app.route('/')
 def index():
-    return HTML_TEMPLATE
+    options = '\n'.join(
+        f'                    <option value="{escape(app_type)}">{escape(label)}</option>'
+        for app_type, label in template_registry.app_types()
+    )
+    return HTML_TEMPLATE.replace('{{APP_TYPE_OPTIONS}}', options)
 
 @app.route('/generate', methods=['POST'])
 def generate_aia():
@@ -569,11 +340,16 @@ def generate_aia():
         app_name = data.get('appName', 'MyApp').strip()
         app_type = data.get('appType', 'basic')
         prompt = data.get('prompt', '').strip()
+        # Compact .scm/.bky output is the default; pass "compact": false for indented JSON
+        compact = data.get('compact', True)
 
         # Validate inputs
         if not app_name:
             return jsonify({'error': 'App name is required'}), 400
 
+        if not isinstance(compact, bool):
+            return jsonify({'error': 'compact must be true or false'}), 400
+
         # Clean app name for file system - only alphanumeric and underscore
         clean_app_name = ''.join(c if c.isalnum() else '_' for c in app_name)
         if not clean_app_name or clean_app_name.replace('_', '') == '':
@@ -617,27 +393,38 @@ color.primary.light=&HFFC5CAE9"""
             aia_file.writestr('youngandroidproject/project.properties', project_properties)
 
             # 3. Screen1.scm - The screen definition (this is critical!)
-            screen_json = json.dumps(project_data, indent=2, separators=(',', ': '))
-            screen_scm_content = f'#|\n$JSON\n{screen_json}\n|#'
+            screen_scm_content = wrap_json_envelope(serialize_json(project_data, compact))
             aia_file.writestr(f'src/appinventor/ai_user/{clean_app_name}/Screen1.scm', screen_scm_content)
 
             # 4. Screen1.bky - The blocks definition (this is where the issue was!)
-            blocks_json = json.dumps(blocks_data, indent=2, separators=(',', ': '))
-            blocks_bky_content = f'#|\n$JSON\n{blocks_json}\n|#'
+            blocks_bky_content = wrap_json_envelope(serialize_json(blocks_data, compact))
             aia_file.writestr(f'src/appinventor/ai_user/{clean_app_name}/Screen1.bky', blocks_bky_content)
 
             # 5. Create empty directories (these are required)
             aia_file.writestr('assets/.gitkeep', '')
             aia_file.writestr('build/.gitkeep', '')
 
+            # Raw/compressed byte counts of every member, e.g. "src/.../Screen1.scm=2270/612"
+            member_sizes = ', '.join(
+                f'{quote(info.filename, safe="/.")}={info.file_size}/{info.compress_size}'
+                for info in aia_file.infolist()
+            )
+
         aia_buffer.seek(0)
 
-        return send_file(
+        response = send_file(
             aia_buffer,
             as_attachment=True,
             download_name=f'{clean_app_name}.aia',
             mimetype='application/zip'
         )
+        backend = 'orjson' if orjson is not None else 'json'
+        response.headers['X-AIA-Serializer'] = f"{backend}; {'compact' if compact else 'indented'}"
+        response.headers['X-AIA-Member-Sizes'] = member_sizes
+        return response
+
+    except UnknownAppTypeError as e:
+        return jsonify({'error': str(e)}), 400
 
     except Exception as e:
         print(f"Error generating AIA: {str(e)}")
@@ -0,0 +1,277 @@
+import json
+import os
+import string
+import threading
+import uuid
+
+try:
+    import yaml
+except ImportError:  # YAML templates are optional
+    yaml = None
+
+# Directory holding one template file per app type
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app_templates')
+
+# Seconds between two background checks for changed template files
+RELOAD_INTERVAL = 2.0
+
+DEFAULT_APP_TYPE = 'basic'
+
+# Placeholders available to template property values, e.g. "Welcome to {app_name}!"
+PLACEHOLDERS = {"app_name": ""}
+
+JSON_EXTENSIONS = ('.json',)
+YAML_EXTENSIONS = ('.yaml', '.yml')
+
+
+class TemplateError(ValueError):
+    """Raised when a template file is malformed"""
+
+
+class CompiledComponent:
+    """A component tree node prepared once so rendering only copies dicts"""
+
+    __slots__ = ('properties', 'dynamic', 'children')
+
+    def __init__(self, properties, dynamic, children):
+        self.properties = properties
+        self.dynamic = dynamic
+        self.children = children
+
+    def render(self, context):
+        component = dict(self.properties)
+        for key in self.dynamic:
+            component[key] = component[key].format_map(context)
+        component["Uuid"] = str(uuid.uuid4())
+        if self.children is not None:
+            component["$Components"] = [child.render(context) for child in self.children]
+        return component
+
+
+class CompiledTemplate:
+    """A validated app template ready to produce Screen1 components"""
+
+    def __init__(self, app_type, label, components, path=None, mtime=None):
+        self.app_type = app_type
+        self.label = label
+        self.components = components
+        self.path = path
+        self.mtime = mtime
+
+    def render(self, app_name):
+        context = {"app_name": app_name}
+        return [component.render(context) for component in self.components]
+
+
+def _require(condition, message, source):
+    if not condition:
+        raise TemplateError(f"{source}: {message}")
+
+
+def _expand_grid(spec, grid, source):
+    """Expand a "$Grid" shorthand into the cells of a TableArrangement"""
+    _require(isinstance(grid, dict), '"$Grid" must be an object', source)
+    try:
+        columns = int(spec.get("Columns", 0))
+        rows = int(spec.get("Rows", 0))
+    except (TypeError, ValueError):
+        raise TemplateError(f'{source}: "Columns" and "Rows" must be integers') from None
+    _require(columns > 0 and rows > 0, 'grid arrangements need positive "Columns" and "Rows"', source)
+
+    cell_defaults = grid.get("Cell", {})
+    cells = grid.get("Cells", [])
+    _require(isinstance(cell_defaults, dict), '"Cell" must be an object', source)
+    _require(isinstance(cells, list), '"Cells" must be a list', source)
+    _require(len(cells) <= columns * rows,
+             f'{len(cells)} cells do not fit a {rows}x{columns} grid', source)
+
+    children = []
+    for index, cell in enumerate(cells):
+        _require(isinstance(cell, dict), 'grid cells must be objects', source)
+        # Keep "$Name" first like the rest of the .scm output
+        child = {"$Name": cell.get("$Name")}
+        child.update(cell_defaults)
+        child.update(cell)
+        child["Column"] = str(index % columns)
+        child["Row"] = str(index // columns)
+        children.append(child)
+    return children
+
+
+def _check_placeholders(value, where, source):
+    """Allow only bare placeholders such as {app_name}, no attributes, indexes or conversions"""
+    try:
+        fields = [(name, format_spec, conversion)
+                  for _, name, format_spec, conversion in string.Formatter().parse(value)
+                  if name is not None]
+    except ValueError as e:
+        raise TemplateError(f'{source}: bad placeholder in {where}: {e}') from e
+    for name, format_spec, conversion in fields:
+        field = name + (f'!{conversion}' if conversion else '') + (f':{format_spec}' if format_spec else '')
+        _require(name in PLACEHOLDERS and not format_spec and conversion is None,
+                 f'bad placeholder {{{field}}} in {where}', source)
+
+
+def _compile_component(spec, source, names):
+    _require(isinstance(spec, dict), 'components must be objects', source)
+    _require(isinstance(spec.get("$Name"), str) and spec["$Name"], 'component is missing "$Name"', source)
+    _require(isinstance(spec.get("$Type"), str) and spec["$Type"], f'{spec["$Name"]} is missing "$Type"', source)
+    _require(spec["$Name"] not in names, f'duplicate component name {spec["$Name"]}', source)
+    names.add(spec["$Name"])
+
+    properties = {}
+    dynamic = []
+    children_specs = spec.get("$Components")
+    for key, value in spec.items():
+        _require(isinstance(key, str), f'{spec["$Name"]} has a non-string property name {key!r}', source)
+        if key in ("$Components", "$Grid", "Uuid"):
+            continue
+        _require(isinstance(value, (str, int, float)),
+                 f'{spec["$Name"]}.{key} must be a string or number', source)
+        # App Inventor stores every property as a string
+        value = value if isinstance(value, str) else str(value)
+        if '{' in value or '}' in value:
+            _check_placeholders(value, f'{spec["$Name"]}.{key}', source)
+            dynamic.append(key)
+        properties[key] = value
+
+    if "$Grid" in spec:
+        _require(children_specs is None, f'{spec["$Name"]} cannot have both "$Grid" and "$Components"', source)
+        children_specs = _expand_grid(spec, spec["$Grid"], source)
+
+    children = None
+    if children_specs is not None:
+        _require(isinstance(children_specs, list), '"$Components" must be a list', source)
+        children = tuple(_compile_component(child, source, names) for child in children_specs)
+
+    return CompiledComponent(properties, tuple(dynamic), children)
+
+
+def compile_template(data, source='<template>'):
+    """Validate a parsed template document and compile it"""
+    _require(isinstance(data, dict), 'template must be an object', source)
+    app_type = data.get("type")
+    _require(isinstance(app_type, str) and app_type, 'template is missing "type"', source)
+    components = data.get("components")
+    _require(isinstance(components, list) and components, 'template needs a non-empty "components" list', source)
+
+    label = data.get("label", app_type.title())
+    _require(isinstance(label, str) and label, '"label" must be a non-empty string', source)
+
+    names = set()
+    compiled = tuple(_compile_component(component, source, names) for component in components)
+    return CompiledTemplate(app_type, label, compiled)
+
+
+def load_template_file(path):
+    """Parse and compile a single JSON or YAML template file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in YAML_EXTENSIONS and yaml is None:
+        raise TemplateError(f"{path}: PyYAML is not installed")
+
+    parse_errors = (json.JSONDecodeError, UnicodeDecodeError) + ((yaml.YAMLError,) if yaml is not None else ())
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) if extension in YAML_EXTENSIONS else json.load(f)
+    except parse_errors as e:
+        raise TemplateError(f"{path}: {e}") from e
+
+    template = compile_template(data, path)
+    template.path = path
+    template.mtime = os.path.getmtime(path)
+    return template
+
+
+class UnknownAppTypeError(LookupError):
+    """Raised when neither the requested nor the default app template is loaded"""
+
+
+class TemplateRegistry:
+    """App templates keyed by app type, reloaded in the background when their files change"""
+
+    def __init__(self, directory=TEMPLATE_DIR, reload_interval=RELOAD_INTERVAL):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self._templates = {}
+        self._files = {}
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.reload()
+
+        if DEFAULT_APP_TYPE not in self._templates:
+            raise TemplateError(f"{self.directory}: no valid '{DEFAULT_APP_TYPE}' template")
+
+        if reload_interval is not None:
+            watcher = threading.Thread(target=self._watch, name='template-reloader', daemon=True)
+            watcher.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Template reload failed: {e}")
+
+    def close(self):
+        """Stop watching the template directory"""
+        self._stop.set()
+
+    def reload(self):
+        """Rescan the template directory, recompiling only changed files"""
+        with self._lock:
+            try:
+                entries = os.scandir(self.directory)
+            except FileNotFoundError:
+                print(f"Template directory not found: {self.directory}")
+                return
+
+            files = {}
+            with entries:
+                for entry in entries:
+                    extension = os.path.splitext(entry.name)[1].lower()
+                    if entry.is_file() and extension in JSON_EXTENSIONS + YAML_EXTENSIONS:
+                        files[entry.path] = entry.stat().st_mtime
+
+            if files == self._mtimes:
+                return
+
+            loaded = {}
+            for path, mtime in sorted(files.items()):
+                template = self._files.get(path)
+                if self._mtimes.get(path) != mtime:
+                    try:
+                        template = load_template_file(path)
+                    except Exception as e:  # one bad file must not stall the whole registry
+                        if template is not None:
+                            print(f"Keeping previous version of template: {e}")
+                        else:
+                            print(f"Skipping template: {e}")
+                if template is not None:
+                    loaded[path] = template
+
+            templates = {}
+            for template in loaded.values():
+                if template.app_type in templates:
+                    print(f"Skipping template {template.path}: duplicate app type {template.app_type}")
+                    continue
+                templates[template.app_type] = template
+
+            # Files that failed are remembered too, so they are only retried once they change
+            self._mtimes = files
+            self._files = loaded
+            self._templates = templates
+
+    def get(self, app_type):
+        """Return the template for app_type, falling back to the basic app"""
+        templates = self._templates
+        template = templates.get(app_type) or templates.get(DEFAULT_APP_TYPE)
+        if template is None:
+            raise UnknownAppTypeError(f"Unknown app type: {app_type}")
+        return template
+
+    def app_types(self):
+        """Return (app_type, label) pairs with the basic app first"""
+        templates = self._templates
+        return sorted(((t.app_type, t.label) for t in templates.values()),
+                      key=lambda item: (item[0] != DEFAULT_APP_TYPE, item[1]))
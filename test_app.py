@@ -0,0 +1,85 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+import app as aia_app
+
+ENVELOPE_HEADER = '#|\n$JSON\n'
+ENVELOPE_FOOTER = '\n|#'
+
+
+def parse_envelope(content):
+    """Read a .scm/.bky file the way App Inventor does: strip the #|$JSON ... |# block"""
+    assert content.startswith(ENVELOPE_HEADER) and content.endswith(ENVELOPE_FOOTER)
+    return json.loads(content[len(ENVELOPE_HEADER):-len(ENVELOPE_FOOTER)])
+
+
+@pytest.fixture(params=['json', 'orjson'])
+def backend(request, monkeypatch):
+    if request.param == 'orjson':
+        monkeypatch.setattr(aia_app, 'orjson', pytest.importorskip('orjson'))
+    else:
+        monkeypatch.setattr(aia_app, 'orjson', None)
+    return request.param
+
+
+@pytest.fixture
+def client():
+    return aia_app.app.test_client()
+
+
+@pytest.mark.parametrize('app_type', ['basic', 'calculator', 'counter', 'clicker'])
+@pytest.mark.parametrize('compact', [True, False])
+def test_serialized_screen_round_trips(backend, app_type, compact):
+    project_data = aia_app.create_project_structure('Café 🎯', app_type, '')
+    blocks_data = aia_app.create_blocks_for_app_type(app_type, project_data["Properties"]["$Components"])
+
+    # Both backends write non-ASCII text as raw UTF-8 rather than \u escapes
+    assert 'Café 🎯' in aia_app.serialize_json(project_data, compact)
+
+    for data in (project_data, blocks_data):
+        serialized = aia_app.serialize_json(data, compact)
+        assert ('\n' not in serialized) is compact
+        assert parse_envelope(aia_app.wrap_json_envelope(serialized)) == data
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_backends_write_identical_output(monkeypatch, compact):
+    orjson = pytest.importorskip('orjson')
+    project_data = aia_app.create_project_structure('Café', 'clicker', '')
+
+    monkeypatch.setattr(aia_app, 'orjson', None)
+    from_json = aia_app.serialize_json(project_data, compact)
+    monkeypatch.setattr(aia_app, 'orjson', orjson)
+    from_orjson = aia_app.serialize_json(project_data, compact)
+
+    assert from_json == from_orjson
+    assert 'Café' in from_json and '🎯' in from_json
+
+
+def test_compact_output_is_smaller(backend):
+    project_data = aia_app.create_project_structure('Calc', 'calculator', '')
+    assert len(aia_app.serialize_json(project_data, True)) < len(aia_app.serialize_json(project_data, False))
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_generate_reports_member_sizes(client, compact):
+    response = client.post('/generate', json={'appName': 'Calc', 'appType': 'calculator', 'compact': compact})
+    assert response.status_code == 200
+    assert response.headers['X-AIA-Serializer'].endswith('compact' if compact else 'indented')
+
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        sizes = {info.filename: f'{info.file_size}/{info.compress_size}' for info in archive.infolist()}
+        screen = archive.read('src/appinventor/ai_user/Calc/Screen1.scm').decode('utf-8')
+
+    reported = dict(entry.split('=') for entry in response.headers['X-AIA-Member-Sizes'].split(', '))
+    assert reported == sizes
+    assert parse_envelope(screen)["Properties"]["AppName"] == 'Calc'
+
+
+@pytest.mark.parametrize('compact', ['false', 0, None])
+def test_generate_rejects_non_boolean_compact(client, compact):
+    response = client.post('/generate', json={'appName': 'Calc', 'compact': compact})
+    assert response.status_code == 400
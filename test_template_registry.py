@@ -0,0 +1,94 @@
+import json
+import os
+
+import pytest
+
+from template_registry import TemplateError, TemplateRegistry, UnknownAppTypeError
+
+BASIC = {"type": "basic", "components": [{"$Name": "WelcomeLabel", "$Type": "Label", "Text": "Hi {app_name}"}]}
+
+
+def write_template(directory, name, data, mtime=None):
+    path = directory / name
+    if isinstance(data, bytes):
+        path.write_bytes(data)
+    else:
+        path.write_text(data if isinstance(data, str) else json.dumps(data), encoding='utf-8')
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_bundled_templates_load():
+    registry = TemplateRegistry(reload_interval=None)
+    assert [app_type for app_type, _ in registry.app_types()][0] == 'basic'
+
+    keypad = registry.get('calculator').render('Calc')[1]["$Components"]
+    assert len(keypad) == 16
+    assert (keypad[3]["$Name"], keypad[3]["Column"], keypad[3]["Row"]) == ("ButtonDivide", "3", "0")
+    assert registry.get('missing').app_type == 'basic'
+
+
+def test_placeholders_are_filled(tmp_path):
+    write_template(tmp_path, 'basic.json', BASIC)
+    registry = TemplateRegistry(str(tmp_path), reload_interval=None)
+    assert registry.get('basic').render('My {App}')[0]["Text"] == 'Hi My {App}'
+
+
+@pytest.mark.parametrize('name, content', [
+    ('grid.json', {"type": "grid", "components": [{"$Name": "Table", "$Type": "TableArrangement",
+                                                   "Columns": "x", "Rows": "2", "$Grid": {"Cells": []}}]}),
+    ('label.json', {"type": "label", "label": 5, "components": [{"$Name": "A", "$Type": "Label"}]}),
+    ('placeholder.json', {"type": "ph", "components": [{"$Name": "A", "$Type": "Label", "Text": "{oops}"}]}),
+    ('attribute.json', {"type": "attr", "components": [{"$Name": "A", "$Type": "Label", "Text": "{app_name.x}"}]}),
+    ('method.json', {"type": "meth", "components": [{"$Name": "A", "$Type": "Label", "Text": "{app_name.upper}"}]}),
+    ('index.json', {"type": "index", "components": [{"$Name": "A", "$Type": "Label", "Text": "{app_name[0]}"}]}),
+    ('conversion.json', {"type": "conv", "components": [{"$Name": "A", "$Type": "Label", "Text": "{app_name!r}"}]}),
+    ('nested.json', {"type": "nested", "components": [{"$Name": "A", "$Type": "Label", "Text": {"a": 1}}]}),
+    ('key.yaml', 'type: key\ncomponents:\n  - $Name: A\n    $Type: Label\n    1: x\n'),
+    ('broken.json', '{"type": '),
+    ('broken.yaml', 'type: [unclosed'),
+    ('latin1.json', '{"type": "caf\xe9"}'.encode('latin-1')),
+])
+def test_bad_templates_are_skipped(tmp_path, name, content):
+    write_template(tmp_path, 'basic.json', BASIC)
+    write_template(tmp_path, name, content)
+    registry = TemplateRegistry(str(tmp_path), reload_interval=None)
+    assert [app_type for app_type, _ in registry.app_types()] == ['basic']
+
+
+def test_missing_default_template_fails_at_startup(tmp_path):
+    with pytest.raises(TemplateError):
+        TemplateRegistry(str(tmp_path), reload_interval=None)
+
+
+def test_failed_edit_keeps_previous_version(tmp_path):
+    write_template(tmp_path, 'basic.json', BASIC)
+    write_template(tmp_path, 'extra.json', {"type": "extra", "components": [{"$Name": "A", "$Type": "Label"}]}, 1000)
+    registry = TemplateRegistry(str(tmp_path), reload_interval=None)
+    previous = registry.get('extra')
+
+    write_template(tmp_path, 'extra.json', '{"type": ', 2000)
+    registry.reload()
+    assert registry.get('extra') is previous
+
+
+def test_removed_default_raises_unknown_app_type(tmp_path):
+    path = write_template(tmp_path, 'basic.json', BASIC)
+    registry = TemplateRegistry(str(tmp_path), reload_interval=None)
+
+    path.unlink()
+    registry.reload()
+    with pytest.raises(UnknownAppTypeError):
+        registry.get('basic')
+
+
+def test_bad_file_does_not_block_other_templates(tmp_path):
+    write_template(tmp_path, 'basic.json', BASIC)
+    registry = TemplateRegistry(str(tmp_path), reload_interval=None)
+
+    write_template(tmp_path, 'bad.json', {"type": "bad", "components": [{"$Name": "A", "$Type": "Label",
+                                                                       "Text": "{app_name.x}"}]})
+    write_template(tmp_path, 'new.json', {"type": "new", "components": [{"$Name": "A", "$Type": "Label"}]})
+    registry.reload()
+    assert [app_type for app_type, _ in registry.app_types()] == ['basic', 'new']